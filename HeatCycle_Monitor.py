@@ -5,17 +5,19 @@
 
 import sys
 import os
+import functools
 import time
 import math
-import datetime as dt
 import threading
 import queue
+from collections import OrderedDict
 import tkinter as tk
 import tkinter.font as tkfont
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 
+import numpy as np
 import matplotlib
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.figure import Figure
 from matplotlib.ticker import FuncFormatter
 
@@ -24,6 +26,7 @@ from PIL import Image, ImageTk
 import japanize_matplotlib  # noqa: F401
 
 from compowayf_driver import CompoWayFDriver
+from power_avg import SlidingAveragePower
 
 
 # ==== シリアル・計測設定 ====
@@ -32,7 +35,19 @@ E5CD_NODE = "01"
 CURRENT_NODE = "02"
 SID = "0"
 POLL_MS = 0
+POLL_ERROR_LOG_INTERVAL_SEC = 5.0  # 同じ種類のポーリング失敗はこの間隔で1回だけ表示
+POLL_ERROR_RETRY_SEC = 0.2  # 例外で失敗したときは少し待ってから再試行（空回り防止）
 VOLTAGE_V = 200.0  # 指定通り電圧は固定
+POWER_WINDOW_SEC = 60.0  # 平均電力を求める窓幅
+HISTORY_CAPACITY = 86400  # グラフ履歴の保持上限[サンプル数]（POLL_MS=0 の約7Hzなら約3.4時間分）
+PLOT_MAX_POINTS = 2500  # 1本の線に渡す点数の目安（約1240px幅で1列あたり最小/最大の2点）
+DRAIN_MS = 20  # 受信キューを空にする周期
+REDRAW_INTERVAL_SEC = 0.1  # グラフ更新の最短間隔（最大10Hz）
+REDRAW_INTERVAL_MAX_SEC = 0.8  # GUI が追いつかないときに間引く上限
+DRAIN_SATURATION_TICKS = 10  # この回数続けて周期に遅れたら描画レートを半分にする
+X_HEADROOM_RATIO = 0.10  # X軸を伸ばすときの余白（軸の変更回数を抑えて blit を効かせる）
+X_HEADROOM_MIN_SEC = 10.0
+PLOT_BASE_DPI = 100  # 画面幅 1920px のときのグラフ DPI（画面幅に比例させる）
 
 
 # ---- デザイン設定 ----
@@ -51,6 +66,309 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 DEVICE1_IMAGE_PATH = os.path.join(script_dir, "product_1.png")
 DEVICE2_IMAGE_PATH = os.path.join(script_dir, "product_2.png")
 LOGO_IMAGE_PATH = os.path.join(script_dir, "Leister_Logo_hq.png")
+RESIZE_CACHE_SIZE = 16  # リサイズ済み画像のキャッシュ件数（LRU）
+RESIZE_DEBOUNCE_MS = 50  # リサイズ操作が落ち着いてから高画質で作り直すまでの待ち
+RESIZE_PYRAMID_WIDTHS = (200, 300, 400, 600, 800, 1200)  # 起動時に LANCZOS で作っておく縮小段
+
+
+class RingBuffer:
+    """時刻・値ペアの固定長リングバッファ
+
+    各サンプルを [i] と [i + capacity] の2か所に書き込むことで、
+    折り返し中でも times / values が常に連続スライス（ビュー）になる。
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = int(capacity)
+        # 時刻・値を1つの (2, 2*capacity) 配列に SoA で持つ（各行は連続なので
+        # times / values は float64[::1] の連続ビューのまま取り出せる）
+        self._data = np.zeros((2, 2 * self.capacity), dtype=np.float64)
+        self._t = self._data[0]
+        self._v = self._data[1]
+        self._head = 0  # 最古サンプルの位置
+        self._n = 0
+        self.first_index = 0  # 最古サンプルの通し番号（上書きで捨てた件数）
+        # 値の最小・最大キャッシュ（追加時は新しい値とだけ比較し、
+        # 現在の最小/最大そのものが破棄されたときだけ NumPy で再計算）
+        self._vmin = math.inf
+        self._vmax = -math.inf
+        self._range_stale = False
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def times(self) -> np.ndarray:
+        return self._t[self._head:self._head + self._n]
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._v[self._head:self._head + self._n]
+
+    def append(self, t: float, v: float) -> None:
+        idx = (self._head + self._n) % self.capacity
+        if self._n == self.capacity:
+            # 満杯なら最古を上書き。消えるのが現在の最小/最大のときだけ再計算が必要
+            evicted = self._v[idx]
+            if evicted == self._vmin or evicted == self._vmax:
+                self._range_stale = True
+        self._t[idx] = self._t[idx + self.capacity] = t
+        self._v[idx] = self._v[idx + self.capacity] = v
+        if self._n < self.capacity:
+            self._n += 1
+        else:
+            self._head = (self._head + 1) % self.capacity
+            self.first_index += 1
+        if v < self._vmin:
+            self._vmin = v
+        if v > self._vmax:
+            self._vmax = v
+
+    def snapshot(self, max_points: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """他スレッドに渡せる (times, values)。
+
+        折り返すまで append は保持範囲より後ろにしか書かないので、半分埋まるまでは
+        ビューをそのまま返す（上書きされるまで capacity/2 回以上の append が必要で、
+        描画スレッドはそれより十分早く使い終わる）。それ以降はコピーする。
+        max_points を超える場合は区間ごとの最小/最大に間引いた配列（新規確保）を返す。
+        """
+        if max_points is not None and self._n > max_points:
+            return _decimate_minmax(self.times, self.values, self.first_index, max_points)
+        if self._n <= self.capacity // 2:
+            return self.times, self.values
+        return self.times.copy(), self.values.copy()
+
+    def value_range(self) -> Tuple[float, float]:
+        """保持中の値の (最小, 最大) を返す"""
+        if self._range_stale:
+            values = self.values
+            self._vmin = float(values.min()) if self._n else math.inf
+            self._vmax = float(values.max()) if self._n else -math.inf
+            self._range_stale = False
+        return self._vmin, self._vmax
+
+
+def _decimate_minmax(
+    t: np.ndarray, v: np.ndarray, first_index: int, max_points: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """等サンプル数の区間ごとに最小・最大の2点（時刻順）だけを残す。
+
+    区間の境界はサンプルの通し番号（first_index 起点）で固定するので、
+    新しいサンプルが来ても既存区間の選ばれる点が変わらず、線がちらつかない。
+    端数になった先頭/末尾の区間はそのまま残し、最古・最新のサンプルは常に含める
+    （最新点が落ちると線の終端が読み値より遅れて見える）。
+    """
+    n = len(t)
+    size = -(-2 * n // max_points)  # 1区間のサンプル数（切り上げ）
+    start = (-first_index) % size
+    k = (n - start) // size
+    stop = start + k * size
+    block = v[start:stop].reshape(k, size)
+    i_min = block.argmin(axis=1)
+    i_max = block.argmax(axis=1)
+    base = start + np.arange(k) * size
+    idx = np.empty(2 * k, dtype=np.intp)
+    idx[0::2] = base + np.minimum(i_min, i_max)
+    idx[1::2] = base + np.maximum(i_min, i_max)
+    idx = np.concatenate((np.arange(start), idx, np.arange(stop, n)))
+    # 区間の最小/最大が端点でなかったときだけ追加（idx は昇順なので端に足すだけで済む）
+    if idx[0] != 0:
+        idx = np.concatenate(((0,), idx))
+    if idx[-1] != n - 1:
+        idx = np.concatenate((idx, (n - 1,)))
+    return t[idx], v[idx]
+
+
+class Reading(NamedTuple):
+    """ポーリング1周期分の測定値（読めなかった項目は None）"""
+
+    now: float
+    pv: Optional[float]
+    sv: Optional[float]
+    current_a: Optional[float]
+
+
+def _value_of(resp: Optional[dict]) -> Optional[float]:
+    """ドライバの応答 dict から数値だけを取り出す"""
+    value = resp.get("value") if resp else None
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class PlotJob(NamedTuple):
+    """描画スレッドに渡すグラフのスナップショット（配列は以後書き換わらないもの）"""
+
+    size: Tuple[int, int]
+    power_unit: str
+    temp_t: np.ndarray
+    temp_v: np.ndarray
+    power_t: np.ndarray
+    power_v: np.ndarray
+    xlim: Tuple[float, float]
+    temp_ylim: Optional[Tuple[float, float]]
+    power_ylim: Optional[Tuple[float, float]]
+
+
+class PlotRenderer:
+    """Figure と Agg キャンバスを専有し、別スレッドでオフスクリーン描画する
+
+    Tk スレッドは submit() でスナップショットを渡し、描き上がった RGBA フレームを
+    take_frame() で受け取るだけ。Figure には描画スレッド以外から触れない。
+    ジョブは1枠のキューで受け、未処理の古いジョブは新しいもので置き換える。
+    """
+
+    def __init__(
+        self,
+        format_elapsed: Callable[[float, int], str],
+        dpi: float = PLOT_BASE_DPI,
+        compact: bool = False,
+    ) -> None:
+        fig = Figure(figsize=(1240 / dpi, 820 / dpi), dpi=dpi)
+        fig.patch.set_facecolor(BG_COLOR)
+        gs = fig.add_gridspec(2, 1, hspace=0.32)
+        self.ax_temp = fig.add_subplot(gs[0])
+        self.ax_power = fig.add_subplot(gs[1], sharex=self.ax_temp)
+        fig.subplots_adjust(left=0.1, right=0.95, top=0.92, bottom=0.08)
+        self.fig = fig
+
+        tick_style = (
+            dict(labelsize=12, width=1.2, length=5, pad=6)
+            if compact
+            else dict(labelsize=16, width=1.8, length=8, pad=10)
+        )
+        for ax in (self.ax_temp, self.ax_power):
+            ax.set_facecolor(PANEL_COLOR)
+            ax.tick_params(axis="x", colors=TEXT_PRIMARY, **tick_style)
+            ax.tick_params(axis="y", colors=TEXT_PRIMARY, **tick_style)
+            for spine in ax.spines.values():
+                spine.set_color("#1e293b")
+            ax.grid(True, color=GRID_COLOR, alpha=0.55, linewidth=1.2)
+
+        self.ax_temp.set_ylabel("温度 [℃]", color=TEXT_PRIMARY, labelpad=18)
+        elapsed_formatter = FuncFormatter(format_elapsed)
+        self.ax_temp.xaxis.set_major_formatter(elapsed_formatter)
+        self.ax_temp.tick_params(axis="x", which="both", labelbottom=False)
+
+        self.ax_power.set_ylabel("平均消費電力 [W]", color=TEXT_PRIMARY, labelpad=20)
+        self.ax_power.xaxis.set_major_formatter(elapsed_formatter)
+
+        # 線は blit で個別に描くため animated=True（通常の全体描画には含めない）
+        (self.temp_line,) = self.ax_temp.plot([], [], color=TEMP_COLOR, linewidth=4.0, animated=True)
+        (self.power_line,) = self.ax_power.plot(
+            [], [], color=POWER_COLOR, linewidth=4.2, label="Average Power", animated=True
+        )
+
+        self._power_unit = "W"
+        self._power_kw_formatter = FuncFormatter(lambda value, _: f"{value / 1000:.2f}")
+        self._power_watt_formatter = self.ax_power.yaxis.get_major_formatter()
+
+        self.ax_temp.set_title("温度の推移", color=TEXT_PRIMARY, fontweight="bold", fontsize=30, pad=16)
+        self.ax_power.set_title("直近1分間の平均消費電力", color=TEXT_PRIMARY, fontweight="bold", fontsize=30, pad=16,)
+
+        self.canvas = FigureCanvasAgg(fig)
+        self._size: Optional[Tuple[int, int]] = None
+
+        # blit 用の背景キャッシュ（全体描画のたびに取り直す）
+        self._bg_cache: Dict[object, object] = {}
+        self.canvas.mpl_connect("draw_event", self._on_canvas_draw)
+
+        self._jobs: "queue.Queue[Optional[PlotJob]]" = queue.Queue(maxsize=1)
+        self._frame: Optional[Tuple[int, int, bytes]] = None
+        self._frame_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    # ---- Tk スレッド側 API ----
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, timeout: float) -> None:
+        self._replace_job(None)
+        if self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+
+    def submit(self, job: PlotJob) -> None:
+        self._replace_job(job)
+
+    def take_frame(self) -> Optional[Tuple[int, int, bytes]]:
+        """描き上がった最新フレーム (幅, 高さ, RGBA) を取り出す。無ければ None"""
+        with self._frame_lock:
+            frame, self._frame = self._frame, None
+        return frame
+
+    def _replace_job(self, job: Optional[PlotJob]) -> None:
+        # 生産者は Tk スレッドのみなので、空けてから入れれば溢れない
+        try:
+            self._jobs.get_nowait()
+        except queue.Empty:
+            pass
+        self._jobs.put_nowait(job)
+
+    # ---- 描画スレッド側 ----
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            try:
+                frame = self._render(job)
+            except Exception as exc:  # デバッグログ
+                print("[ERR] 描画失敗:", exc, file=sys.stderr)
+                continue
+            with self._frame_lock:
+                self._frame = frame
+
+    def _render(self, job: PlotJob) -> Tuple[int, int, bytes]:
+        full = False
+
+        if job.size != self._size:
+            width, height = job.size
+            dpi = self.fig.dpi
+            self.fig.set_size_inches(width / dpi, height / dpi)
+            self._size = job.size
+            full = True
+
+        if job.power_unit != self._power_unit:
+            self._power_unit = job.power_unit
+            if job.power_unit == "kW":
+                self.ax_power.set_ylabel("平均消費電力 [kW]", color=TEXT_PRIMARY, labelpad=20)
+                self.ax_power.yaxis.set_major_formatter(self._power_kw_formatter)
+            else:
+                self.ax_power.set_ylabel("平均消費電力 [W]", color=TEXT_PRIMARY, labelpad=20)
+                self.ax_power.yaxis.set_major_formatter(self._power_watt_formatter)
+            full = True
+
+        self.temp_line.set_data(job.temp_t, job.temp_v)
+        self.power_line.set_data(job.power_t, job.power_v)
+
+        if self.ax_temp.get_xlim() != job.xlim:
+            self.ax_temp.set_xlim(*job.xlim)  # ax_power は sharex で追従
+            full = True
+        for ax, ylim in ((self.ax_temp, job.temp_ylim), (self.ax_power, job.power_ylim)):
+            if ylim is not None and ax.get_ylim() != ylim:
+                ax.set_ylim(*ylim)
+                full = True
+
+        if full or not self._bg_cache:
+            self.canvas.draw()  # draw_event で背景を取り直し線も描く
+        else:
+            for ax, line in ((self.ax_temp, self.temp_line), (self.ax_power, self.power_line)):
+                self.canvas.restore_region(self._bg_cache[ax])
+                ax.draw_artist(line)
+
+        w, h = self.canvas.get_width_height()
+        return w, h, bytes(self.canvas.buffer_rgba())
+
+    def _on_canvas_draw(self, event=None) -> None:
+        """全体描画の直後に軸ごとの背景を保存し、線を重ねる"""
+        self._bg_cache = {
+            ax: self.canvas.copy_from_bbox(ax.bbox) for ax in (self.ax_temp, self.ax_power)
+        }
+        self.ax_temp.draw_artist(self.temp_line)
+        self.ax_power.draw_artist(self.power_line)
 
 
 class App(tk.Tk):
@@ -77,21 +395,20 @@ class App(tk.Tk):
         except tk.TclError:
             pass
 
-        self.t0 = dt.datetime.now()
-        self.temp_times: List[dt.datetime] = []
-        self.temp_values: List[float] = []
-        self.current_times: List[dt.datetime] = []
-        self.currents: List[float] = []
-        self.power_times: List[dt.datetime] = []
-        self.power_values: List[float] = []
+        self.t0 = time.monotonic()  # 時刻は全て単調時計の秒(float)で扱う（NTP 補正等で戻らない）
+        # グラフ用の履歴は t0 からの経過秒で保持
+        self.temp_buf = RingBuffer(HISTORY_CAPACITY)
+        # 電流は直近 POWER_WINDOW_SEC 秒の台形積分を逐次更新する（単調時計の秒）
+        self.power_avg = SlidingAveragePower(POWER_WINDOW_SEC, VOLTAGE_V)
+        self.power_buf = RingBuffer(HISTORY_CAPACITY)
 
         # センサー未接続でも GUI は起動させる
         try:
             self.cwf = CompoWayFDriver(port=PORT)
         except Exception:
             self.cwf = None
-
-        self.io_lock = threading.Lock()
+        # self.cwf（シリアルポート）に触れるのは poll_worker スレッドだけなのでロックは持たない。
+        # GUI から書き込み等を追加する場合は CompoWayFDriver 側で排他すること。
 
         # レイアウト：左(80%) / 右(20%)
         self.columnconfigure(0, weight=1)
@@ -109,6 +426,11 @@ class App(tk.Tk):
         self._img_labels: Dict[int, tk.Label] = {}
         self._caption_labels: Dict[int, Optional[tk.Label]] = {}
         self._img_tk_cache: Dict[int, object] = {}
+        # 画像キー -> 幅昇順の LANCZOS 縮小段（最後は原寸）
+        self._img_pyramids: Dict[object, List["Image.Image"]] = {}
+        # (画像キー, 幅, 高さ) -> 縮小済み PhotoImage
+        self._resize_cache: "OrderedDict[Tuple[object, int, int], ImageTk.PhotoImage]" = OrderedDict()
+        self._image_refresh_id: Optional[str] = None
         self._pil_available = Image is not None and ImageTk is not None
 
         # 左（グラフ）
@@ -132,12 +454,15 @@ class App(tk.Tk):
         self._build_showcase(right_frame)  # デバイス1/2のみ
 
         # === 企業ロゴはウィンドウ直下に直接配置 ===
-        self.logo_image_pil: Optional["Image.Image"] = self._load_image_pil(LOGO_IMAGE_PATH)
+        self.logo_image_pil: Optional["Image.Image"] = self._load_image_pil(LOGO_IMAGE_PATH, key="logo")
         self.logo_label = tk.Label(self, bg=BG_COLOR, bd=0, highlightthickness=0)
         self._logo_tk_ref: Optional[object] = None  # GC防止用参照
 
+        # ポーリングスレッド → GUI の受け渡し（ロック1つとリストの差し替えだけで済ませる）
+        self._sample_lock = threading.Lock()
+        self._pending_samples: List[Reading] = []
+
         # ポーリングスレッド（無ければ起動しない）
-        self.result_q = queue.Queue()
         self.stop_evt = threading.Event()
         if self.cwf is not None:
             self.worker = threading.Thread(target=self.poll_worker, daemon=True)
@@ -145,6 +470,13 @@ class App(tk.Tk):
         else:
             self.worker = None
 
+        # 受信は DRAIN_MS 周期で取り込み、描画は間引く（起動直後に空のグラフを1回描く）
+        self._dirty = True
+        self._last_draw_ts = 0.0
+        self._redraw_interval = REDRAW_INTERVAL_SEC
+        self._late_ticks = 0
+        # 次回の取り込み時刻（単調時計）。処理時間ぶん周期が伸びないよう目標時刻から逆算する
+        self._next_drain = time.monotonic() + 0.1
         self.after(100, self.drain_results)
 
         # フルスクリーン起動 + 解除/トグル
@@ -162,51 +494,52 @@ class App(tk.Tk):
 
     # ------------------------------------------------------------------
     def _build_graph_area(self, parent: tk.Frame) -> None:
-        fig = Figure(figsize=(12.4, 8.2), dpi=100)
-        fig.patch.set_facecolor(BG_COLOR)
-        gs = fig.add_gridspec(2, 1, hspace=0.32)
-        self.ax_temp = fig.add_subplot(gs[0])
-        self.ax_power = fig.add_subplot(gs[1], sharex=self.ax_temp)
-        fig.subplots_adjust(left=0.1, right=0.95, top=0.92, bottom=0.08)
-
-        for ax in (self.ax_temp, self.ax_power):
-            ax.set_facecolor(PANEL_COLOR)
-            ax.tick_params(axis="x", colors=TEXT_PRIMARY, labelsize=16, width=1.8, length=8, pad=10)
-            ax.tick_params(axis="y", colors=TEXT_PRIMARY, labelsize=16, width=1.8, length=8, pad=10)
-            for spine in ax.spines.values():
-                spine.set_color("#1e293b")
-            ax.grid(True, color=GRID_COLOR, alpha=0.55, linewidth=1.2)
-
-        self.ax_temp.set_ylabel("温度 [℃]", color=TEXT_PRIMARY, labelpad=18)
-        elapsed_formatter = FuncFormatter(self._format_elapsed_time)
-        self.ax_temp.xaxis.set_major_formatter(elapsed_formatter)
-        self.ax_temp.tick_params(axis="x", which="both", labelbottom=False)
-
-        self.ax_power.set_ylabel("平均消費電力 [W]", color=TEXT_PRIMARY, labelpad=20)
-        self.ax_power.xaxis.set_major_formatter(elapsed_formatter)
-
-        (self.temp_line,) = self.ax_temp.plot([], [], color=TEMP_COLOR, linewidth=4.0)
-        (self.power_line,) = self.ax_power.plot([], [], color=POWER_COLOR, linewidth=4.2, label="Average Power")
+        # グラフは描画スレッドでオフスクリーン描画し、出来たフレームを Label に貼る
+        # DPI は画面幅に比例（高解像度画面では高く）、狭い画面では目盛りを小さく
+        screen_w = max(1, self.winfo_screenwidth())
+        self.renderer = PlotRenderer(
+            self._format_elapsed_time,
+            dpi=max(72.0, PLOT_BASE_DPI * screen_w / 1920),
+            compact=screen_w < 1600,
+        )
+        parent.configure(width=1240, height=820)
+        parent.grid_propagate(False)  # 貼った画像サイズで枠が広がらないように固定
+        self.plot_label = tk.Label(parent, bg=BG_COLOR, bd=0, highlightthickness=0)
+        self.plot_label.grid(row=0, column=0, sticky="nsew")
+        self.plot_label.bind("<Configure>", self._on_plot_resize)
+        self._plot_size: Tuple[int, int] = (1240, 820)
+        self._plot_photo: Optional["ImageTk.PhotoImage"] = None
+        self._xlim: Tuple[float, float] = (0.0, 1.0)
 
         self._power_unit = "W"
         self._power_key_pressed = False
-        self._power_kw_formatter = FuncFormatter(lambda value, _: f"{value / 1000:.2f}")
-        self._power_watt_formatter = self.ax_power.yaxis.get_major_formatter()
         self.bind("<KeyPress-k>", self._on_power_unit_key_press)
         self.bind("<KeyRelease-k>", self._on_power_unit_key_release)
 
-        self.ax_temp.set_title("温度の推移", color=TEXT_PRIMARY, fontweight="bold", fontsize=30, pad=16)
-        self.ax_power.set_title("直近1分間の平均消費電力", color=TEXT_PRIMARY, fontweight="bold", fontsize=30, pad=16,)
-
-        canvas = FigureCanvasTkAgg(fig, master=parent)
-        self.canvas_widget = canvas.get_tk_widget()
-        self.canvas_widget.configure(bg=BG_COLOR, highlightthickness=0)
-        self.canvas_widget.grid(row=0, column=0, sticky="nsew")
-        self.canvas = canvas
-        self.canvas.draw_idle()
+        self.renderer.start()
+
+    def _on_plot_resize(self, event: tk.Event) -> None:
+        size = (max(1, event.width), max(1, event.height))
+        if size != self._plot_size:
+            self._plot_size = size
+            self._dirty = True
+
+    def _show_frame(self, frame: Tuple[int, int, bytes]) -> None:
+        """描画スレッドが仕上げた RGBA フレームを Label に表示する（Tk スレッド）"""
+        width, height, rgba = frame
+        img = Image.frombuffer("RGBA", (width, height), rgba, "raw", "RGBA", 0, 1)
+        photo = self._plot_photo
+        if photo is not None and (photo.width(), photo.height()) == (width, height):
+            photo.paste(img)
+        else:
+            self._plot_photo = ImageTk.PhotoImage(img)
+            self.plot_label.configure(image=self._plot_photo)
 
     # ------------------------------------------------------------------
-    def _format_elapsed_time(self, value: float, _: int = 0) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _format_elapsed_time(value: float, _: int = 0) -> str:
+        # 目盛り位置は再描画のたびにほぼ同じなので結果をキャッシュする
         if not math.isfinite(value) or value < 0:
             return ""
         total_seconds = int(round(value))
@@ -233,6 +566,7 @@ class App(tk.Tk):
             bg=PANEL_COLOR,
         )
         self.lbl_sv_value.grid(row=1, column=0, sticky="w", pady=(0, 0))
+        self._last_sv_text = "-- ℃"
 
     # ------------------------------------------------------------------
     def _build_showcase(self, parent: tk.Frame) -> None:
@@ -248,7 +582,7 @@ class App(tk.Tk):
             frame.columnconfigure(0, weight=1)
             frame.rowconfigure(0, weight=1)
 
-            self._img_sources[idx] = self._load_image_pil(path)
+            self._img_sources[idx] = self._load_image_pil(path, key=idx)
 
             label = tk.Label(frame, bg=PANEL_COLOR)
             label.grid(row=0, column=0, sticky="nsew")
@@ -265,45 +599,91 @@ class App(tk.Tk):
             caption_label.grid(row=1, column=0, sticky="ew", pady=(12, 0))
             self._caption_labels[idx] = caption_label
 
-            frame.bind("<Configure>", lambda event, section_idx=idx: self._update_section_image(section_idx))
+            frame.bind("<Configure>", lambda event, section_idx=idx: self._on_section_resize(section_idx))
 
         self.after(0, self._refresh_showcase_images)
 
     # ------------------------------------------------------------------
-    def _load_image_pil(self, path: Optional[str]) -> Optional["Image.Image"]:
+    def _load_image_pil(self, path: Optional[str], key: object = None) -> Optional["Image.Image"]:
         if not path or not self._pil_available:
             return None
         try:
-            return Image.open(path).convert("RGBA")
+            pil_img = Image.open(path).convert("RGBA")
         except Exception:
             return None
+        if key is not None:
+            self._img_pyramids[key] = self._build_pyramid(pil_img)
+        return pil_img
 
-    def _resize_image_keep_aspect(self, pil_img: "Image.Image", max_w: int, max_h: int) -> "ImageTk.PhotoImage":
+    @staticmethod
+    def _build_pyramid(pil_img: "Image.Image") -> List["Image.Image"]:
+        """重い LANCZOS 縮小を起動時に済ませておく（原寸より小さい段のみ）"""
+        w, h = pil_img.size
+        levels = [
+            pil_img.resize((lw, max(1, round(h * lw / w))), Image.LANCZOS)
+            for lw in RESIZE_PYRAMID_WIDTHS
+            if lw < w
+        ]
+        levels.append(pil_img)
+        return levels
+
+    def _resize_image_keep_aspect(
+        self, pil_img: "Image.Image", max_w: int, max_h: int, key: object = None, final: bool = True
+    ) -> "ImageTk.PhotoImage":
         max_w = max(1, max_w)
         max_h = max(1, max_h)
         w, h = pil_img.size
         scale = min(max_w / w, max_h / h)  # contain
         new_size = (max(1, int(w * scale)), max(1, int(h * scale)))
-        resized = pil_img.resize(new_size, Image.LANCZOS)
-        return ImageTk.PhotoImage(resized)
+        return self._get_resized_photo(key, pil_img, new_size, final)
+
+    def _get_resized_photo(
+        self, key: object, pil_img: "Image.Image", size: Tuple[int, int], final: bool
+    ) -> "ImageTk.PhotoImage":
+        """縮小結果を (key, 幅, 高さ) で LRU キャッシュする。
+
+        縮小段があれば目標幅以上で最小の段から BILINEAR で仕上げる（小さな縮小なので
+        見た目は LANCZOS と変わらない）。段が無い画像は従来どおり LANCZOS。
+        final=False（ドラッグ中のリサイズ）でキャッシュに無ければ、
+        軽い BILINEAR で仮表示し、キャッシュには入れない。
+        """
+        cache_key = (key, size[0], size[1])
+        photo = self._resize_cache.get(cache_key)
+        if photo is not None:
+            self._resize_cache.move_to_end(cache_key)
+            return photo
+        levels = self._img_pyramids.get(key)
+        if levels:
+            src = next((lv for lv in levels if lv.size[0] >= size[0]), levels[-1])
+            resample = Image.BILINEAR
+        else:
+            src = pil_img
+            resample = Image.LANCZOS if final else Image.BILINEAR
+        photo = ImageTk.PhotoImage(src.resize(size, resample))
+        if not final:
+            return photo
+        self._resize_cache[cache_key] = photo
+        if len(self._resize_cache) > RESIZE_CACHE_SIZE:
+            self._resize_cache.popitem(last=False)  # 表示中の画像は別途参照を保持している
+        return photo
 
     def _create_placeholder_image(self, width: int, height: int) -> tk.PhotoImage:
         width = max(1, width)
         height = max(1, height)
         image = tk.PhotoImage(width=width, height=height)
-        for x in range(width):
-            blend = x / max(1, width - 1)
-            r = int(18 + (46 - 18) * blend)
-            g = int(30 + (110 - 30) * blend)
-            b = int(60 + (180 - 60) * blend)
-            color = f"#{r:02x}{g:02x}{b:02x}"
-            image.put(color, to=(x, 0, x + 1, height))
+        # 横グラデーション1行分を作り、to= の矩形全体へ1回の put でタイル描画させる
+        denom = max(1, width - 1)
+        row = " ".join(
+            f"#{int(18 + 28 * x / denom):02x}{int(30 + 80 * x / denom):02x}{int(60 + 120 * x / denom):02x}"
+            for x in range(width)
+        )
+        image.put("{" + row + "}", to=(0, 0, width, height))
         overlay_color = "#1f2937"
         overlay_height = max(1, int(height * 0.2))
         image.put(overlay_color, to=(0, height - overlay_height, width, height))
         return image
 
-    def _update_section_image(self, idx: int) -> None:
+    def _update_section_image(self, idx: int, final: bool = True) -> None:
         label = self._img_labels.get(idx)
         if not label or not label.winfo_exists():
             return
@@ -319,7 +699,7 @@ class App(tk.Tk):
 
         pil_src = self._img_sources.get(idx)
         if pil_src is not None and self._pil_available:
-            tk_img = self._resize_image_keep_aspect(pil_src, frame_width, frame_height)
+            tk_img = self._resize_image_keep_aspect(pil_src, frame_width, frame_height, key=idx, final=final)
         else:
             tk_img = self._create_placeholder_image(frame_width, frame_height)
 
@@ -330,8 +710,23 @@ class App(tk.Tk):
         for idx in list(self._img_labels.keys()):
             self._update_section_image(idx)
 
+    def _on_section_resize(self, idx: int) -> None:
+        self._update_section_image(idx, final=False)
+        self._schedule_image_refresh()
+
+    def _schedule_image_refresh(self) -> None:
+        """連続する <Configure> をまとめ、落ち着いたら1回だけ高画質で作り直す"""
+        if self._image_refresh_id is not None:
+            self.after_cancel(self._image_refresh_id)
+        self._image_refresh_id = self.after(RESIZE_DEBOUNCE_MS, self._finish_image_refresh)
+
+    def _finish_image_refresh(self) -> None:
+        self._image_refresh_id = None
+        self._refresh_showcase_images()
+        self._update_logo_position()
+
     # === ロゴ（右端に直接配置） ==========================================
-    def _update_logo_position(self, event: Optional[tk.Event] = None) -> None:
+    def _update_logo_position(self, event: Optional[tk.Event] = None, final: bool = True) -> None:
         """ウィンドウ右端にロゴを直貼り（横幅=ウィンドウの20%）。高さは比率で決定。"""
         total_w = max(1, self.winfo_width())
         total_h = max(1, self.winfo_height())
@@ -346,8 +741,7 @@ class App(tk.Tk):
             scale = logo_w / max(1, w)
             new_w = max(1, int(w * scale))
             new_h = max(1, int(h * scale))
-            resized = self.logo_image_pil.resize((new_w, new_h), Image.LANCZOS)
-            tk_img = ImageTk.PhotoImage(resized)
+            tk_img = self._get_resized_photo("logo", self.logo_image_pil, (new_w, new_h), final)
             self._logo_tk_ref = tk_img
             self.logo_label.configure(image=tk_img)
             logo_h = new_h
@@ -372,8 +766,9 @@ class App(tk.Tk):
         target_right = int(total_w * self._right_ratio)
         self.grid_columnconfigure(1, weight=0, minsize=target_right)
         self.grid_columnconfigure(0, weight=1)
-        # ロゴ位置/サイズも更新
-        self._update_logo_position()
+        # ロゴ位置/サイズも更新（高画質化はリサイズが落ち着いてから）
+        self._update_logo_position(final=False)
+        self._schedule_image_refresh()
 
     def _on_right_frame_resize(self, event: tk.Event) -> None:
         if event.widget is not self.right_frame:
@@ -383,190 +778,161 @@ class App(tk.Tk):
             minsize = int(total_h * ratio)
             self.right_frame.grid_rowconfigure(row, minsize=minsize, weight=1)
 
-    # ------------------------------------------------------------------
-    @staticmethod
-    def _compute_average_power_w(
-        times: List[dt.datetime],
-        currents: List[float],
-        now: dt.datetime,
-        voltage_v: float,
-        window_sec: float = 60.0,
-    ) -> float:
-        if not times or not currents or window_sec <= 0:
-            return 0.0
-
-        cutoff = now - dt.timedelta(seconds=window_sec)
-        if times[-1] < cutoff:
-            return 0.0
-
-        pts = []
-        n = len(times)
-
-        start_idx = 0
-        while start_idx < n and times[start_idx] < cutoff:
-            start_idx += 1
-
-        if start_idx == 0:
-            pass
-        elif start_idx < n:
-            t_prev = times[start_idx - 1]
-            i_prev = currents[start_idx - 1]
-            t_next = times[start_idx]
-            i_next = currents[start_idx]
-            if t_next > t_prev:
-                ratio = (cutoff - t_prev).total_seconds() / (t_next - t_prev).total_seconds()
-                ratio = max(0.0, min(1.0, ratio))
-                i_interp = i_prev + (i_next - i_prev) * ratio
-                pts.append((cutoff, i_interp))
-        else:
-            pts.append((cutoff, currents[-1]))
-
-        for idx in range(start_idx, n):
-            if times[idx] >= cutoff:
-                pts.append((times[idx], currents[idx]))
-
-        if not pts:
-            return 0.0
-
-        if pts[0][0] > cutoff:
-            pts.insert(0, (cutoff, pts[0][1]))
-        if pts[-1][0] < now:
-            pts.append((now, pts[-1][1]))
-
-        total_current_seconds = 0.0
-        for idx in range(len(pts) - 1):
-            t0, i0 = pts[idx]
-            t1, i1 = pts[idx + 1]
-            if t1 <= t0:
-                continue
-            dt_seconds = (t1 - t0).total_seconds()
-            avg_current = 0.5 * (i0 + i1)
-            total_current_seconds += avg_current * dt_seconds
-
-        average_current = total_current_seconds / window_sec
-        return voltage_v * average_current
-
     # ------------------------------------------------------------------
     def poll_worker(self) -> None:
+        err_last_ts: Dict[str, float] = {}  # 例外の型名 -> 最後に表示した時刻
+        err_suppressed: Dict[str, int] = {}  # 例外の型名 -> 表示を省いた回数
         while not self.stop_evt.is_set():
             cycle_start = time.perf_counter()
-            now = dt.datetime.now()
-
-            pv = {"value": None}
-            sv = {"value": None}
-            current_resp = {"value": None}
+            now = time.monotonic()
 
+            pv = sv = current_a = None
+            failed = False
             try:
-                with self.io_lock:
-                    pv = self.cwf.read_e5cd_pv_decimal(node=E5CD_NODE, sid=SID)
-                    sv = self.cwf.read_e5cd_sv_decimal(node=E5CD_NODE, sid=SID)
-                    current_resp = self.cwf.read_g3pw_current_amps(node=CURRENT_NODE, sid=SID)
-            except Exception as exc:  # デバッグログ
-                print("[ERR] ポーリング失敗:", exc, file=sys.stderr)
-
-            self.result_q.put((now, pv, sv, current_resp))
+                pv_resp, sv_resp, current_resp = self.cwf.read_triplet(
+                    node_e5cd=E5CD_NODE, node_g3pw=CURRENT_NODE, sid=SID
+                )
+                pv, sv, current_a = _value_of(pv_resp), _value_of(sv_resp), _value_of(current_resp)
+            except Exception as exc:  # デバッグログ（切断中などに毎周期出力しないよう間引く）
+                failed = True
+                key = type(exc).__name__
+                if now - err_last_ts.get(key, -math.inf) >= POLL_ERROR_LOG_INTERVAL_SEC:
+                    skipped = err_suppressed.pop(key, 0)
+                    extra = f"（前回表示以降 {skipped} 回省略）" if skipped else ""
+                    print(f"[ERR] ポーリング失敗: {exc}{extra}", file=sys.stderr)
+                    err_last_ts[key] = now
+                else:
+                    err_suppressed[key] = err_suppressed.get(key, 0) + 1
+
+            reading = Reading(now, pv, sv, current_a)
+            with self._sample_lock:
+                self._pending_samples.append(reading)
 
             spent = time.perf_counter() - cycle_start
             sleep_time = max(0.0, POLL_MS / 1000.0 - spent)
+            if failed:
+                sleep_time = max(sleep_time, POLL_ERROR_RETRY_SEC)
             if self.stop_evt.wait(timeout=sleep_time):
                 break
 
     # ------------------------------------------------------------------
     def drain_results(self) -> None:
-        try:
-            while True:
-                now, pv, sv, current_resp = self.result_q.get_nowait()
-
-                if pv.get("value") is not None:
-                    try:
-                        pv_value = float(pv["value"])
-                    except (TypeError, ValueError):
-                        pv_value = None
-                    if pv_value is not None:
-                        self.temp_times.append(now)
-                        self.temp_values.append(pv_value)
-
-                if sv.get("value") is not None:
-                    try:
-                        sv_value = float(sv["value"])
-                        sv_text = f"{sv_value:.1f} ℃"
-                    except (TypeError, ValueError):
-                        sv_text = f"{sv['value']}"
-                    self.lbl_sv_value.config(text=sv_text)
-
-                if current_resp.get("value") is not None:
-                    try:
-                        current_val = float(current_resp["value"])
-                    except (TypeError, ValueError):
-                        current_val = None
-                    if current_val is not None:
-                        self.current_times.append(now)
-                        self.currents.append(current_val)
-
-                        avg_power_w = self._compute_average_power_w(
-                            self.current_times,
-                            self.currents,
-                            now,
-                            voltage_v=VOLTAGE_V,
-                            window_sec=60.0,
-                        )
-
-                        self.power_times.append(now)
-                        self.power_values.append(avg_power_w)
-
-                        cutoff = now - dt.timedelta(seconds=120)
-                        while self.current_times and self.current_times[0] < cutoff:
-                            self.current_times.pop(0)
-                            self.currents.pop(0)
-
-                elapsed_temp: List[float] = []
-                elapsed_power: List[float] = []
-
-                if self.temp_times:
-                    elapsed_temp = [
-                        (ts - self.t0).total_seconds() for ts in self.temp_times
-                    ]
-                    self.temp_line.set_data(elapsed_temp, self.temp_values)
-                    t_min = min(self.temp_values)
-                    t_max = max(self.temp_values)
-                    if t_min == t_max:
-                        t_min -= 1.0
-                        t_max += 1.0
-                    padding = max(1.0, (t_max - t_min) * 0.15)
-                    self.ax_temp.set_ylim(t_min - padding, t_max + padding)
-
-                if self.power_times:
-                    elapsed_power = [
-                        (ts - self.t0).total_seconds() for ts in self.power_times
-                    ]
-                    self.power_line.set_data(elapsed_power, self.power_values)
-                    p_min = min(self.power_values)
-                    p_max = max(self.power_values)
-                    if p_min == p_max:
-                        pad = max(0.05, p_max * 0.1 if p_max else 0.1)
-                        p_min -= pad
-                        p_max += pad
-                    padding = max(0.05, (p_max - p_min) * 0.15)
-                    self.ax_power.set_ylim(p_min - padding, p_max + padding)
-
-                if elapsed_temp or elapsed_power:
-                    x_candidates = [1.0]
-                    if elapsed_temp:
-                        x_candidates.append(elapsed_temp[-1])
-                    if elapsed_power:
-                        x_candidates.append(elapsed_power[-1])
-                    x_max = max(x_candidates)
-                    if elapsed_temp:
-                        self.ax_temp.set_xlim(0.0, x_max)
-                    if elapsed_power:
-                        self.ax_power.set_xlim(0.0, x_max)
-
-                self.canvas.draw_idle()
-        except queue.Empty:
-            pass
+        """キューを短周期で空にし、描画は REDRAW_INTERVAL_SEC 以上空けて行う"""
+        with self._sample_lock:
+            batch, self._pending_samples = self._pending_samples, []
+        for reading in batch:
+            self._ingest_sample(reading)
+            self._dirty = True
+
+        if self._dirty and time.perf_counter() - self._last_draw_ts >= self._redraw_interval:
+            self._refresh_plot()
+            self._dirty = False
+            self._last_draw_ts = time.perf_counter()
+
+        frame = self.renderer.take_frame()
+        if frame is not None:
+            self._show_frame(frame)
 
         if not self.stop_evt.is_set():
-            self.after(120, self.drain_results)
+            self.after(self._next_drain_delay_ms(), self.drain_results)
+
+    def _next_drain_delay_ms(self) -> int:
+        """次の drain_results までの待ち[ms]。遅れが続くときは描画レートを落として知らせる"""
+        period = DRAIN_MS / 1000.0
+        now = time.monotonic()
+        self._next_drain += period
+        delay = self._next_drain - now
+        if delay > 0:
+            self._late_ticks = 0
+            return max(1, int(delay * 1000))
+
+        # 周期に間に合っていない。大きく遅れた分は取り戻さず（連続実行で UI を塞がない）今から数え直す
+        if delay < -period:
+            self._next_drain = now
+        self._late_ticks += 1
+        if self._late_ticks >= DRAIN_SATURATION_TICKS and self._redraw_interval < REDRAW_INTERVAL_MAX_SEC:
+            self._redraw_interval = min(REDRAW_INTERVAL_MAX_SEC, self._redraw_interval * 2)
+            self._late_ticks = 0
+            print(
+                f"[WARN] 画面更新が受信に追いついていません。描画間隔を {self._redraw_interval:.1f} 秒に広げます",
+                file=sys.stderr,
+            )
+        return 1
+
+    def _ingest_sample(self, reading: Reading) -> None:
+        """1サンプル分の測定値をバッファと設定温度ラベルに反映する（描画はしない）"""
+        now = reading.now
+        if reading.pv is not None:
+            self.temp_buf.append(now - self.t0, reading.pv)
+
+        if reading.sv is not None:
+            sv_text = f"{reading.sv:.1f} ℃"
+            if sv_text != self._last_sv_text:  # 変化したときだけ Tk に渡す（再レイアウトを避ける）
+                self.lbl_sv_value.config(text=sv_text)
+                self._last_sv_text = sv_text
+
+        if reading.current_a is not None:
+            self.power_avg.push(now, reading.current_a)
+            self.power_buf.append(now - self.t0, self.power_avg.average_w(now))
+
+    def _refresh_plot(self) -> None:
+        """バッファのスナップショットと軸範囲を描画スレッドへ渡す"""
+        temp_ylim = None
+        power_ylim = None
+
+        if len(self.temp_buf):
+            t_min, t_max = self.temp_buf.value_range()
+            if t_min == t_max:
+                t_min -= 1.0
+                t_max += 1.0
+            padding = max(1.0, (t_max - t_min) * 0.15)
+            temp_ylim = (t_min - padding, t_max + padding)
+
+        if len(self.power_buf):
+            p_min, p_max = self.power_buf.value_range()
+            if p_min == p_max:
+                pad = max(0.05, p_max * 0.1 if p_max else 0.1)
+                p_min -= pad
+                p_max += pad
+            padding = max(0.05, (p_max - p_min) * 0.15)
+            power_ylim = (p_min - padding, p_max + padding)
+
+        if temp_ylim is not None or power_ylim is not None:
+            x_candidates = [1.0]
+            if temp_ylim is not None:
+                x_candidates.append(self.temp_buf.times[-1])
+            if power_ylim is not None:
+                x_candidates.append(self.power_buf.times[-1])
+            x_end = max(x_candidates)
+            # 履歴が上限に達したら保持している最古サンプルを左端にする
+            x_min = min(
+                (buf.times[0] for buf in (self.temp_buf, self.power_buf) if len(buf) == buf.capacity),
+                default=0.0,
+            )
+            # 両端とも余白付きで段階的に動かす（毎サンプル軸が変わると blit できない）
+            # 左端は最古サンプルが余白分より先へ進んだときだけ追いつかせる
+            cur_min, cur_max = self._xlim
+            # 余白は表示中の幅に比例させる（経過時間に比例させると履歴が一周した後に右の空白が広がり続ける）
+            margin = max(X_HEADROOM_MIN_SEC, (x_end - x_min) * X_HEADROOM_RATIO)
+            if x_end > cur_max or x_min < cur_min or x_min - cur_min > margin:
+                x_max = max(x_end + margin, cur_max)
+                self._xlim = (x_min, x_max)
+
+        temp_t, temp_v = self.temp_buf.snapshot(PLOT_MAX_POINTS)
+        power_t, power_v = self.power_buf.snapshot(PLOT_MAX_POINTS)
+        self.renderer.submit(
+            PlotJob(
+                size=self._plot_size,
+                power_unit=self._power_unit,
+                temp_t=temp_t,
+                temp_v=temp_v,
+                power_t=power_t,
+                power_v=power_v,
+                xlim=self._xlim,
+                temp_ylim=temp_ylim,
+                power_ylim=power_ylim,
+            )
+        )
 
     # ------------------------------------------------------------------
     def _on_power_unit_key_press(self, event: tk.Event) -> None:
@@ -582,22 +948,16 @@ class App(tk.Tk):
             self._power_key_pressed = False
 
     def _toggle_power_axis_units(self) -> None:
+        # 軸ラベルと目盛り書式の切り替えは描画スレッド側で反映される
         self._power_unit = "kW" if self._power_unit == "W" else "W"
-        if self._power_unit == "kW":
-            self.ax_power.set_ylabel("平均消費電力 [kW]", color=TEXT_PRIMARY, labelpad=20)
-            self.ax_power.yaxis.set_major_formatter(self._power_kw_formatter)
-        else:
-            self.ax_power.set_ylabel("平均消費電力 [W]", color=TEXT_PRIMARY, labelpad=20)
-            self.ax_power.yaxis.set_major_formatter(self._power_watt_formatter)
-
-        self.ax_power.relim()
-        self.ax_power.autoscale_view()
-        self.canvas.draw_idle()
+        self._dirty = True
 
     # ------------------------------------------------------------------
     def on_close(self) -> None:
         try:
             self.stop_evt.set()
+            if hasattr(self, "renderer"):
+                self.renderer.stop(timeout=1.5)
             if hasattr(self, "worker") and self.worker is not None and self.worker.is_alive():
                 self.worker.join(timeout=1.5)
             if hasattr(self, "cwf") and self.cwf:
@@ -10,24 +10,66 @@ CompoWay/F minimal driver class (SID = 1 digit)
     - read_e5cd_sv_decimal(node="01", sid="0")
         -> {"cmd_hex": "<Node+Sub+SID+CMD>", "value": <int or None>}
         ※ 送信コマンドは元コードのまま(0101810003000001)。コメントにあった 0101C1... と不一致注意。
+    - read_e5cd_pv_sv_decimal(node="01", sid="0")
+        -> (<PV と同じ dict>, <SV と同じ dict>)
+        ※ 複合読出（MRC/SRC=01/04）で PV と SV を1往復で読む。非対応なら個別読出にフォールバック
     - read_g3pw_current_amps(node="02", sid="0")
         -> {"cmd_hex": "<Node+Sub+SID+CMD>", "value": <float or None>}
         ※ CE:0004 は 0.1A単位 → A。先頭8桁/10 を基本、0の場合は末尾4桁/10 をフォールバック
+    - read_triplet(node_e5cd="01", node_g3pw="02", sid="0")
+        -> (<PV dict>, <SV dict>, <電流 dict>)
+        ※ E5CD 複合読出と G3PW 電流読出を間を空けずに続けて行う（ポーリング1周期分）
 """
 
+import functools
+import operator
 import time
 import serial
 
 STX, ETX = 0x02, 0x03
+_STX_B, _ETX_B = bytes([STX]), bytes([ETX])
+
+# 固定コマンド（MRC/SRC + 変数種別 + アドレス + 要素数）
+CMD_E5CD_PV = "0101800000000001"
+CMD_E5CD_SV = "0101810003000001"  # ←必要なら "0101C10003000001" に変更
+CMD_E5CD_PV_SV = "0104" + "80000000" + "81000300"
+CMD_G3PW_CURRENT = "01018E0004000001"
+
+# 複合読出を「非対応」とみなす応答（これ以外のエラーは一時的なものとして次回また複合読出を試す）
+#   終了コード 14: フォーマットエラー
+#   応答コード 0401: 未サポートコマンド / 10xx, 11xx: コマンド長・要素数・変数種別・アドレス等の不一致
+_COMPOSITE_UNSUPPORTED_END = frozenset({"14"})
+_COMPOSITE_UNSUPPORTED_RES = frozenset({
+    b"0401", b"1001", b"1002", b"1003", b"1100", b"1101", b"1103", b"1104", b"110B",
+})
+
+
+def _split_composite(data: bytes):
+    """複合読出のデータ部（応答コードの後ろ）を [(変数種別, 値の16進), ...] に分ける。
+
+    1要素の桁数は変数種別で決まる（8x: ワード=4桁, Cx: ダブルワード=8桁）。
+    解釈できない種別や長さなら None。
+    """
+    items = []
+    i, n = 0, len(data)
+    while i < n:
+        var_type = data[i:i + 2]
+        width = {b"8": 4, b"C": 8}.get(var_type[:1])
+        if width is None or i + 2 + width > n:
+            return None
+        items.append((var_type, data[i + 2:i + 2 + width]))
+        i += 2 + width
+    return items
 
 class CompoWayFDriver:
     def __init__(
         self,
         port="/dev/ttyUSB0",
         baudrate=9600,
-        timeout=0,        # ★ 短い分割timeout（実際の受信猶予は rx_deadline で管理）
+        timeout=0.05,     # ★ 短いブロッキングtimeout（実際の受信猶予は rx_deadline で管理）
         write_timeout=0,  # ★ 送信停滞の早期検出
-        rx_deadline=0.25    # ★ 1往復の最大待ち（ETX＋BCCまで）
+        rx_deadline=0.25,   # ★ 1往復の最大待ち（ETX＋BCCまで）
+        inter_byte_timeout=0.01,  # ★ フレーム途中で途切れたら早めに見切る
     ):
         self.ser = serial.Serial(
             port,
@@ -37,8 +79,19 @@ class CompoWayFDriver:
             stopbits=serial.STOPBITS_TWO,
             timeout=timeout,
             write_timeout=write_timeout,
+            inter_byte_timeout=inter_byte_timeout,
         )
         self.rx_deadline = float(rx_deadline)
+        self._composite_supported = True  # 複合読出が拒否されたら以後は個別読出
+        # 受信バッファはインスタンスごとに1つを使い回す（フレームは数十バイト）
+        self._rx_buf = bytearray(256)
+        self._rx_mv = memoryview(self._rx_buf)
+        self._rx_pending = b""  # 前回のフレーム（BCC）より後ろまで読んでいた分。次の受信の先頭に使う
+        # (node, sub, sid, cmd) -> (送信フレーム, cmd_hex_sent)。コマンドは固定なので毎回組み立てない
+        self._frame_cache = {}
+        for node, cmd in (("01", CMD_E5CD_PV_SV), ("01", CMD_E5CD_PV),
+                          ("01", CMD_E5CD_SV), ("02", CMD_G3PW_CURRENT)):
+            self._get_or_build_frame(node, "00", "0", cmd)
 
     def __enter__(self): return self
     def __exit__(self, exc_type, exc, tb): self.close()
@@ -49,9 +102,8 @@ class CompoWayFDriver:
     # ------------- low-level helpers -------------
     @staticmethod
     def _bcc_ascii_hex(payload: bytes) -> bytes:
-        x = 0
-        for b in payload: x ^= b
-        return bytes([x & 0xFF])
+        # XOR 畳み込みは C 実装の reduce に任せる（バイトごとの Python ループを避ける）
+        return bytes((functools.reduce(operator.xor, payload, 0),))
 
     @staticmethod
     def _z2(s: str) -> str:
@@ -62,95 +114,175 @@ class CompoWayFDriver:
         Frame: [STX][Node(2)][Sub(2)][SID(1)][CMD(ASCII HEX...)][ETX][BCC]
         ※ SIDは1桁（"0"〜"9"）を想定
         """
-        node_hex = self._z2(node_hex)
-        sub_hex  = self._z2(sub_hex)
         if not sid_ascii or len(sid_ascii) != 1:
             raise ValueError("SID must be exactly ONE ASCII char (e.g., '0').")
-        body = (node_hex + sub_hex + sid_ascii + cmd_hex).encode("ascii")
-        payload = body + bytes([ETX])              # BCCは Node..ETX
-        return bytes([STX]) + payload + self._bcc_ascii_hex(payload)
+        payload = f"{node_hex:0>2}{sub_hex:0>2}{sid_ascii}{cmd_hex}\x03".encode("ascii")  # BCCは Node..ETX
+        return _STX_B + payload + self._bcc_ascii_hex(payload)
+
+    def _get_or_build_frame(self, node: str, sub: str, sid: str, cmd_hex: str):
+        """送信フレームと cmd_hex_sent をキー単位でメモ化して返す"""
+        key = (node, sub, sid, cmd_hex)
+        cached = self._frame_cache.get(key)
+        if cached is None:
+            frame = self._make_frame(node_hex=node, sub_hex=sub, sid_ascii=sid, cmd_hex=cmd_hex)
+            cached = (frame, self._z2(node) + self._z2(sub) + sid + cmd_hex)
+            self._frame_cache[key] = cached
+        return cached
 
     def _read_one_response(self, deadline_s: float) -> bytes:
         """
         STX…ETX+BCC を1フレーム受信。ETXまで到達しなければ b'' を返す。
         deadline_s: 受信全体の猶予（serial.timeoutより長くできる）
+        BCC より後ろまで読んだ分は _rx_pending に残し、次の呼び出しで先に使う
+        （遅れた応答と次の応答が1回の読みでまとめて届いても後ろのフレームを失わない）。
         """
-        end_time = time.perf_counter() + float(deadline_s)
-
-        # 1) STX待ち
-        buf = bytearray()
-        while time.perf_counter() < end_time:
-            b = self.ser.read(1)
-            if not b:
-                continue
-            if b[0] == STX:
-                buf.extend(b)
-                break
+        end_time = time.monotonic() + float(deadline_s)
+
+        # 1) STX待ち。前回読み過ぎた分に STX があればそこから始める
+        #    （read_until は serial.timeout までブロックして待つので空回りしない）
+        pending = self._rx_pending
+        self._rx_pending = b""
+        stx = pending.find(_STX_B)
+        if stx >= 0:
+            pending = pending[stx:]
         else:
-            return b""  # STXが来なかった
-
-        # 2) ETXまで（断続的に読み続け、見つかったらBCC 1バイト追い読み）
-        seen_etx = False
-        while time.perf_counter() < end_time:
-            chunk = self.ser.read(256)
-            if not chunk:
-                continue
-            buf.extend(chunk)
-            if ETX in chunk:
-                seen_etx = True
-                bcc = self.ser.read(1)  # BCC
-                if bcc:
-                    buf.extend(bcc)
-                break
-
-        if not seen_etx:
-            return b""  # 不完全フレームは破棄
-
-        return bytes(buf)
+            while not self.ser.read_until(_STX_B).endswith(_STX_B):
+                if time.monotonic() >= end_time:
+                    return b""  # STXが来なかった
+            pending = _STX_B
+
+        # 2) ETX＋BCC まで、届いている分をまとめて固定バッファへ readinto
+        buf, mv = self._rx_buf, self._rx_mv
+        n = len(pending)
+        buf[:n] = pending
+        scan = 1
+        etx = -1
+        waited = False
+        while True:
+            if etx < 0:
+                etx = buf.find(ETX, scan, n)
+                scan = n
+            if 0 <= etx < n - 1:
+                # ETX の次の1バイトが BCC。その後ろは次のフレーム（の一部）かもしれないので残す
+                self._rx_pending = bytes(mv[etx + 2:n])
+                return bytes(mv[:etx + 2])
+            if waited and time.monotonic() >= end_time:
+                return b""  # 不完全フレームは破棄
+            want = min(max(1, self.ser.in_waiting), len(buf) - n)
+            if want <= 0:
+                return b""  # バッファ超過（異常フレーム）
+            n += self.ser.readinto(mv[n:n + want]) or 0
+            waited = True
 
     @staticmethod
     def _parse_response(resp: bytes):
         """
         応答: STX | node(2) | sub(2) | end(2) | mres(2) | sres(2) | data... | ETX | BCC
+        data_hex は ASCII 16進の bytes のまま返す（int(data_hex, 16) はそのまま使える）
         """
         if not resp or len(resp) < 1 + 2 + 2 + 2 + 2 + 2 + 1 + 1:
             return {"ok": False, "err": "too short", "raw": resp}
         if resp[0] != STX or resp[-2] != ETX:
             return {"ok": False, "err": "bad STX/ETX", "raw": resp}
-        # BCC check（Node..ETX）
-        calc = CompoWayFDriver._bcc_ascii_hex(resp[1:-1])
-        if calc != resp[-1:]:
+        # BCC check（Node..ETX）: 1バイト同士を int で比較（スライスの bytes を作らない）
+        if functools.reduce(operator.xor, resp[1:-1], 0) != resp[-1]:
             return {"ok": False, "err": "BCC mismatch", "raw": resp}
 
+        # ヘッダ10文字は1回だけ decode し、各フィールドは str のスライスで取り出す
         try:
-            node  = resp[1:3].decode()
-            sub   = resp[3:5].decode()
-            end   = resp[5:7].decode()
-            mres  = resp[7:9].decode()
-            sres  = resp[9:11].decode()
-            data_hex = resp[11:-2].decode(errors="replace")
+            head = resp[1:11].decode("ascii")
         except Exception as e:
             return {"ok": False, "err": f"decode error: {e}", "raw": resp}
+        data_hex = resp[11:-2]
+        node, sub, end, mres, sres = head[0:2], head[2:4], head[4:6], head[6:8], head[8:10]
 
         return {"ok": True, "node": node, "sub": sub, "end": end,
                 "mres": mres, "sres": sres, "data_hex": data_hex, "raw": resp}
 
+    @staticmethod
+    def _parse_or_timeout(resp: bytes):
+        return CompoWayFDriver._parse_response(resp) if resp else {"ok": False, "err": "timeout", "raw": b""}
+
+    def _drain_stale_input(self) -> None:
+        """前回の残りバイトがあるときだけ読み捨てる（空なら tcflush の ioctl を省く）"""
+        self._rx_pending = b""
+        waiting = self.ser.in_waiting
+        if waiting:
+            self.ser.read(waiting)
+
+    def _exchange(self, frame: bytes) -> bytes:
+        """送信→1応答受信（ETXまで）。入力バッファの掃除は呼び出し側で行う
+
+        応答の Node が送信先と違うフレーム（前の往復の遅れた応答など）は読み捨てて、
+        rx_deadline の残りで送信先からの応答を待つ。
+        """
+        self.ser.write(frame)
+        self.ser.flush()
+        node_b = frame[1:3]  # 送信フレームの Node(2)
+        end_time = time.monotonic() + self.rx_deadline
+        while True:
+            resp = self._read_one_response(deadline_s=end_time - time.monotonic())
+            if not resp or resp[1:3] == node_b:
+                return resp
+
     def _send_and_get(self, node: str, cmd_hex: str, sid: str = "0", sub: str = "00"):
         """
         1コマンド送信→1応答受信→パース。
         戻りの cmd_hex_sent は「Node+Sub+SID+CMD」（ASCII連結）。
         """
-        frame = self._make_frame(node_hex=node, sub_hex=sub, sid_ascii=sid, cmd_hex=cmd_hex)
+        frame, cmd_hex_sent = self._get_or_build_frame(node, sub, sid, cmd_hex)
         # 前回残りの除去（誤検知/遅延を避ける）
-        self.ser.reset_input_buffer()
-        # 送信
-        self.ser.write(frame)
-        self.ser.flush()
-        # 受信（ETXまで）
-        resp = self._read_one_response(deadline_s=self.rx_deadline)
-        parsed = self._parse_response(resp) if resp else {"ok": False, "err": "timeout", "raw": b""}
-        cmd_hex_sent = (self._z2(node) + self._z2(sub) + sid + cmd_hex)
-        return cmd_hex_sent, parsed
+        self._drain_stale_input()
+        resp = self._exchange(frame)
+        return cmd_hex_sent, self._parse_or_timeout(resp)
+
+    # ------------- response decoders -------------
+    def _decode_pv_sv(self, cmd_hex_sent: str, r: dict, node: str, sid: str):
+        """複合読出の応答を (pv_dict, sv_dict) に。
+
+        非対応（未サポート/フォーマットエラー、または応答の形が違う）と分かったときだけ
+        以後は個別読出に切り替える。BCC エラーやビジー等の一時的なエラーは失敗として返し、
+        次のポーリングでまた複合読出を試す。
+        """
+        failed = ({"cmd_hex": cmd_hex_sent, "value": None}, {"cmd_hex": cmd_hex_sent, "value": None})
+        if not r.get("ok"):
+            return failed  # 通信エラーは個別読出でも同じなので切り替えない
+
+        end = r.get("end")
+        data = r.get("data_hex", b"")
+        res = data[:4]
+        if end == "00" and res == b"0000":
+            items = _split_composite(data[4:])
+            if items and len(items) == 2 and items[0][0] == b"80" and items[1][0] == b"81":
+                pv_word = items[0][1]
+                sv_word = items[1][1]
+                return ({"cmd_hex": cmd_hex_sent, "value": int(pv_word[-4:], 16)},
+                        {"cmd_hex": cmd_hex_sent, "value": int(sv_word, 16)})
+            # 正常終了なのに形が違う＝複合読出を解釈しない機器
+        elif end not in _COMPOSITE_UNSUPPORTED_END and not (
+                end == "00" and res in _COMPOSITE_UNSUPPORTED_RES):
+            return failed  # 一時的なエラー。次回また複合読出を試す
+
+        self._composite_supported = False
+        return (self.read_e5cd_pv_decimal(node=node, sid=sid),
+                self.read_e5cd_sv_decimal(node=node, sid=sid))
+
+    @staticmethod
+    def _decode_current(cmd_hex_sent: str, r: dict):
+        """G3PW 電流応答を {"cmd_hex", "value"[A]} に"""
+        if not r.get("ok") or r.get("end") != "00" or len(r.get("data_hex", b"")) < 4:
+            return {"cmd_hex": cmd_hex_sent, "value": None}
+
+        data = r["data_hex"]
+        head_u32 = int(data[:8], 16) if len(data) >= 8 else 0
+        tail_u16 = int(data[-4:], 16)
+        if head_u32 != 0:
+            value = head_u32 / 10.0
+        elif tail_u16 != 0:
+            value = tail_u16 / 10.0
+        else:
+            value = 0.0
+        return {"cmd_hex": cmd_hex_sent, "value": value}
 
     # ------------- public API -------------
     def read_e5cd_pv_decimal(self, node: str = "01", sid: str = "0"):
@@ -159,9 +291,8 @@ class CompoWayFDriver:
         実機ログ/参照スクリプトに合わせ、**末尾4桁（下位ワード）**を10進化して返す。
         戻り: {"cmd_hex": <Node+Sub+SID+CMD>, "value": <int or None>}
         """
-        cmd = "0101800000000001"
-        cmd_hex_sent, r = self._send_and_get(node=node, cmd_hex=cmd, sid=sid, sub="00")
-        if not r.get("ok") or r.get("end") != "00" or len(r.get("data_hex","")) < 4:
+        cmd_hex_sent, r = self._send_and_get(node=node, cmd_hex=CMD_E5CD_PV, sid=sid, sub="00")
+        if not r.get("ok") or r.get("end") != "00" or len(r.get("data_hex", b"")) < 4:
             return {"cmd_hex": cmd_hex_sent, "value": None}
         tail_dec = int(r["data_hex"][-4:], 16)
         return {"cmd_hex": cmd_hex_sent, "value": tail_dec}
@@ -174,9 +305,8 @@ class CompoWayFDriver:
         先頭8桁が非0ならそれを採用、0の場合は末尾4桁を採用（小数点補正なし）。
         戻り: {"cmd_hex": <Node+Sub+SID+CMD>, "value": <int or None>}
         """
-        cmd = "0101810003000001"  # ←必要なら "0101C10003000001" に変更
-        cmd_hex_sent, r = self._send_and_get(node=node, cmd_hex=cmd, sid=sid, sub="00")
-        if not r.get("ok") or r.get("end") != "00" or len(r.get("data_hex","")) < 4:
+        cmd_hex_sent, r = self._send_and_get(node=node, cmd_hex=CMD_E5CD_SV, sid=sid, sub="00")
+        if not r.get("ok") or r.get("end") != "00" or len(r.get("data_hex", b"")) < 4:
             return {"cmd_hex": cmd_hex_sent, "value": None}
 
         data = r["data_hex"]
@@ -185,27 +315,50 @@ class CompoWayFDriver:
         value = head_val if head_val != 0 else tail_val
         return {"cmd_hex": cmd_hex_sent, "value": value}
 
+    def read_e5cd_pv_sv_decimal(self, node: str = "01", sid: str = "0"):
+        """
+        E5CD: PV (80:0000) と SV (81:0003) を「複合読出」(MRC/SRC=01/04) 1往復で読む。
+        応答データ: 応答コード(4) | 変数種別(2) | データ(4) | 変数種別(2) | データ(4)
+        （80/81 はワード領域なので各4桁。Cx 領域なら8桁）
+        PV は read_e5cd_pv_decimal と同じく下位ワード、SV は 8 桁値を10進化。
+        機器が複合読出を受け付けない場合は以後 read_e5cd_pv_decimal / read_e5cd_sv_decimal を使う。
+        戻り: (pv_dict, sv_dict)  各 {"cmd_hex": <Node+Sub+SID+CMD>, "value": <int or None>}
+        """
+        if not self._composite_supported:
+            return (self.read_e5cd_pv_decimal(node=node, sid=sid),
+                    self.read_e5cd_sv_decimal(node=node, sid=sid))
+
+        cmd_hex_sent, r = self._send_and_get(node=node, cmd_hex=CMD_E5CD_PV_SV, sid=sid, sub="00")
+        return self._decode_pv_sv(cmd_hex_sent, r, node, sid)
+
     def read_g3pw_current_amps(self, node: str = "02", sid: str = "0"):
         """
         G3PW: 電流 (CE:0004) を1回読み、Aに換算して返す（0.1A単位→/10）。
         先頭8桁/10 を基本、**先頭8桁が0で末尾4桁が非0**なら 末尾4桁/10 を採用。
         戻り: {"cmd_hex": <Node+Sub+SID+CMD>, "value": <float or None>}
         """
-        cmd = "01018E0004000001"
-        cmd_hex_sent, r = self._send_and_get(node=node, cmd_hex=cmd, sid=sid, sub="00")
-        if not r.get("ok") or r.get("end") != "00" or len(r.get("data_hex","")) < 4:
-            return {"cmd_hex": cmd_hex_sent, "value": None}
+        cmd_hex_sent, r = self._send_and_get(node=node, cmd_hex=CMD_G3PW_CURRENT, sid=sid, sub="00")
+        return self._decode_current(cmd_hex_sent, r)
 
-        data = r["data_hex"]
-        head_u32 = int(data[:8], 16) if len(data) >= 8 else 0
-        tail_u16 = int(data[-4:], 16)
-        if head_u32 != 0:
-            value = head_u32 / 10.0
-        elif tail_u16 != 0:
-            value = tail_u16 / 10.0
-        else:
-            value = 0.0
-        return {"cmd_hex": cmd_hex_sent, "value": value}
+    def read_triplet(self, node_e5cd: str = "01", node_g3pw: str = "02", sid: str = "0"):
+        """
+        E5CD の PV/SV と G3PW の電流をまとめて読む（ポーリング1周期分）。
+        TX(E5CD) | RX(E5CD) | TX(G3PW) | RX(G3PW) を間にパース等を挟まず続けて行い、
+        応答の解釈は最後にまとめる。半二重バスなので送信同士は重ねない。
+        戻り: (pv_dict, sv_dict, current_dict)
+        """
+        if not self._composite_supported:
+            pv, sv = self.read_e5cd_pv_sv_decimal(node=node_e5cd, sid=sid)
+            return pv, sv, self.read_g3pw_current_amps(node=node_g3pw, sid=sid)
+
+        frame_e5cd, hex_e5cd = self._get_or_build_frame(node_e5cd, "00", sid, CMD_E5CD_PV_SV)
+        frame_g3pw, hex_g3pw = self._get_or_build_frame(node_g3pw, "00", sid, CMD_G3PW_CURRENT)
+        self._drain_stale_input()
+        resp_e5cd = self._exchange(frame_e5cd)
+        resp_g3pw = self._exchange(frame_g3pw)
+
+        pv, sv = self._decode_pv_sv(hex_e5cd, self._parse_or_timeout(resp_e5cd), node_e5cd, sid)
+        return pv, sv, self._decode_current(hex_g3pw, self._parse_or_timeout(resp_g3pw))
 
 
 # 簡易テスト（インポート時は実行されない）
@@ -213,4 +366,6 @@ if __name__ == "__main__":
     with CompoWayFDriver() as cwf:
         print(cwf.read_e5cd_pv_decimal(node="01", sid="0"))
         print(cwf.read_e5cd_sv_decimal(node="01", sid="0"))
+        print(cwf.read_e5cd_pv_sv_decimal(node="01", sid="0"))
         print(cwf.read_g3pw_current_amps(node="02", sid="0"))
+        print(cwf.read_triplet(node_e5cd="01", node_g3pw="02", sid="0"))
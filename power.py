@@ -8,6 +8,8 @@ G3PWへ CompoWay/F コマンド "0101CE0004000001" を1回だけ送信し、
 - 送信1回＋受信1回のみ。G3PWの電流(0.1A単位)をAに換算して出力。
 """
 
+import functools
+import operator
 import serial
 import time
 
@@ -22,10 +24,7 @@ CMD  = "01018E0004000001"  # 変数読出 MRC/SRC=01/01, CE:0004(Current) を1
 
 def bcc_ascii_hex(payload: bytes) -> bytes:
     """BCC = Node〜ETX（STX除く）のXOR 1バイト"""
-    x = 0
-    for b in payload:
-        x ^= b
-    return bytes([x & 0xFF])
+    return bytes((functools.reduce(operator.xor, payload, 0),))
 
 def make_frame(node_hex: str, sub_hex: str, sid_hex: str, cmd_hex: str) -> bytes:
     """
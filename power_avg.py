@@ -0,0 +1,68 @@
+# power_avg.py
+# -*- coding: utf-8 -*-
+"""
+直近の時間窓の平均電力（電流の台形積分）を逐次計算する
+- SlidingAveragePower(window_sec, voltage_v): 直近 window_sec 秒の平均電力[W]をサンプル追加ごとに逐次更新する。
+    push(t, amps) で台形を足し、窓から外れた台形を引く（1サンプルあたり償却 O(1)）。
+    t は time.monotonic() 等の単調増加する時刻[s]。
+    左端は直前サンプルとの線形補間、右端は最新値を now_ts まで保持して台形積分する。
+"""
+
+from collections import deque
+
+
+class SlidingAveragePower:
+    """直近 window_sec 秒の平均電力を逐次計算する（境界の扱いはモジュール docstring のとおり）。
+
+    窓の左端より前のサンプルは補間用に1点だけ残し、隣接サンプル間の台形の和を
+    _sum に持ち続ける。push / average_w の時刻は単調増加で与えること。
+    """
+
+    def __init__(self, window_sec: float, voltage_v: float) -> None:
+        self.window_sec = float(window_sec)
+        self.voltage_v = float(voltage_v)
+        self._samples = deque()  # (t, amps)
+        self._sum = 0.0  # _samples の隣接サンプル間の台形面積の和 [A·s]
+
+    def push(self, t: float, amps: float) -> None:
+        samples = self._samples
+        if samples:
+            t_prev, i_prev = samples[-1]
+            self._sum += 0.5 * (i_prev + amps) * (t - t_prev)
+        samples.append((t, amps))
+        self._evict(t - self.window_sec)
+
+    def _evict(self, cutoff: float) -> None:
+        samples = self._samples
+        while len(samples) >= 2 and samples[1][0] <= cutoff:
+            t0, i0 = samples.popleft()
+            t1, i1 = samples[0]
+            self._sum -= 0.5 * (i0 + i1) * (t1 - t0)
+        if len(samples) == 1:
+            self._sum = 0.0  # 丸め誤差の持ち越しを切る
+
+    def average_w(self, now_ts: float) -> float:
+        """now_ts 時点の直近 window_sec 秒の平均電力[W]"""
+        if self.window_sec <= 0.0 or not self._samples:
+            return 0.0
+        cutoff = now_ts - self.window_sec
+        self._evict(cutoff)
+        samples = self._samples
+        t_last, i_last = samples[-1]
+        if t_last < cutoff:
+            return 0.0
+
+        t0, i0 = samples[0]
+        if t0 < cutoff:
+            # 左端: cutoff で補間し、最初の台形を cutoff 〜 2点目に置き換える
+            t1, i1 = samples[1]
+            i_left = i0 + (i1 - i0) * (cutoff - t0) / (t1 - t0)
+            total = self._sum - 0.5 * (i0 + i1) * (t1 - t0) + 0.5 * (i_left + i1) * (t1 - cutoff)
+        else:
+            total = self._sum + i0 * (t0 - cutoff)
+
+        # 右端: 最新値を now_ts まで保持
+        if now_ts > t_last:
+            total += i_last * (now_ts - t_last)
+
+        return self.voltage_v * total / self.window_sec
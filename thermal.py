@@ -8,14 +8,22 @@ E5CD に CompoWay/F コマンドを高頻度ポーリングして結果を print
 - できるだけ速く回すため、短いtimeout＋明示デッドライン＋バッファ掃除
 """
 
+import argparse
+import functools
+import operator
+import sys
 import time
 import serial
 
 STX, ETX = 0x02, 0x03
 
+# 受信バッファ（毎回確保せず使い回す）
+_RX = bytearray(512)
+_RX_MV = memoryview(_RX)
+
 # ====== 設定 ======
 PORT = "/dev/ttyUSB0"   # Windowsなら "COM5" など
-BAUD = 9600             # 速くしたいなら 19200/38400 に（機器設定と一致させる）
+BAUD = 9600             # 既定値。--baud で上書き（19200/38400 にすると1フレームの線上時間が半分/1/4）
 NODE = "01"
 SUB  = "00"
 SID  = "0"
@@ -34,10 +42,7 @@ RX_DEADLINE_SEC = 0.20
 
 def bcc_ascii_hex(payload: bytes) -> bytes:
     """BCC = Node..ETX を XOR"""
-    x = 0
-    for b in payload:
-        x ^= b
-    return bytes([x & 0xFF])
+    return bytes((functools.reduce(operator.xor, payload, 0),))
 
 
 def make_frame(node_hex: str, sub_hex: str, sid_hex: str, cmd_hex: str) -> bytes:
@@ -48,13 +53,14 @@ def make_frame(node_hex: str, sub_hex: str, sid_hex: str, cmd_hex: str) -> bytes
 
 
 def hexdump(b: bytes) -> str:
-    return " ".join(f"{x:02X}" for x in b)
+    # bytes/memoryview.hex(sep) で一括変換（1バイトごとの f-string を避ける）
+    return b.hex(" ").upper()
 
 
 def parse_response(resp: bytes):
     """
     応答: STX | node(2) | sub(2) | end(2) | mres(2) | sres(2) | data... | ETX | BCC
-    data は ASCII16進文字列
+    data は ASCII16進文字列。resp は bytes でも memoryview でもよい
     """
     if len(resp) < 1 + 2 + 2 + 2 + 2 + 2 + 1 + 1:
         return {"ok": False, "err": "too short"}
@@ -64,68 +70,105 @@ def parse_response(resp: bytes):
     if bcc_ascii_hex(resp[1:-1]) != resp[-1:]:
         return {"ok": False, "err": "BCC mismatch"}
 
-    node = resp[1:3].decode()
-    sub  = resp[3:5].decode()
-    end  = resp[5:7].decode()
-    mres = resp[7:9].decode()
-    sres = resp[9:11].decode()
-    data_hex = resp[11:-2].decode(errors="replace")
-    return {"ok": True, "node": node, "sub": sub, "end": end,
-            "mres": mres, "sres": sres, "data_hex": data_hex}
-
-
-def recv_one_frame(ser: serial.Serial, deadline_sec: float) -> bytes | None:
-    """STX待ち→ETXまで→BCC 1バイトの最小受信。deadline_sec を超えたら None"""
-    end_time = time.perf_counter() + deadline_sec
-    buf = bytearray()
-
-    # 1) STX 待ち
-    while time.perf_counter() < end_time:
-        b = ser.read(1)
-        if not b:
+    # ヘッダ10桁は1回だけデコードして文字列側で切り分ける
+    h = str(resp[1:11], "ascii", "replace")
+    data_hex = str(resp[11:-2], "ascii", "replace")
+    return {"ok": True, "node": h[0:2], "sub": h[2:4], "end": h[4:6],
+            "mres": h[6:8], "sres": h[8:10], "data_hex": data_hex}
+
+
+def recv_one_frame(ser: serial.Serial, deadline_sec: float) -> memoryview | None:
+    """STX…ETX+BCC を1フレーム受信。deadline_sec を超えたら None
+
+    受信は使い回しの _RX に readinto し、フレーム部分の memoryview を返す
+    （次回の呼び出しで上書きされるので、その前に使い終えること）。
+    """
+    pc = time.perf_counter  # ループ内の属性引きを省く
+    end_time = pc() + deadline_sec
+    n = 0
+    scan = 0  # ETX 探索済みの位置（同じバイトを二度探さない）
+    etx_i = -1
+
+    while pc() < end_time:
+        # 届いている分をまとめて読む（無ければ serial.timeout まで1バイト待つ）
+        want = min(max(1, ser.in_waiting), len(_RX) - n)
+        if want <= 0:
+            n = scan = 0  # 溢れた（異常データ）。捨てて読み直す
+            etx_i = -1
+            continue
+        n += ser.readinto(_RX_MV[n:n + want]) or 0
+
+        if etx_i < 0:
+            etx_i = _RX.find(ETX, scan, n)
+            scan = n
+        if etx_i < 0 or etx_i + 1 >= n:
+            continue  # ETX または BCC 待ち
+        stx_i = _RX.rfind(STX, 0, etx_i)
+        if stx_i < 0:
+            # STX の無い ETX はゴミ。後ろの分を先頭に詰めて続ける
+            rest = n - (etx_i + 1)
+            _RX[:rest] = _RX[etx_i + 1:n]
+            n = rest
+            scan = 0
+            etx_i = -1
             continue
-        if b[0] == STX:
-            buf.extend(b)
-            break
-    else:
-        return None  # timeout (STX来ず)
-
-    # 2) 本体読み（ETXが出るまで断続的に読む）
-    while time.perf_counter() < end_time:
-        chunk = ser.read(256)
-        if chunk:
-            buf.extend(chunk)
-            if ETX in chunk:
-                # ETX の後ろに BCC が1バイト来るので追加で1バイト読む
-                bcc = ser.read(1)
-                if bcc:
-                    buf.extend(bcc)
-                break
-
-    return bytes(buf) if len(buf) >= 3 else None
-
-
-def main():
+        return _RX_MV[stx_i:etx_i + 2]  # ETX の後ろ1バイトが BCC
+
+    return None  # timeout（STX/ETX が揃わず）
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="E5CD CompoWay/F 高頻度ポーリング")
+    ap.add_argument("--port", default=PORT, help=f"シリアルポート（既定: {PORT}）")
+    ap.add_argument("--baud", type=int, default=BAUD,
+                    help=f"通信速度（既定: {BAUD}）。E5CD 側の通信速度設定も同じ値に変更すること")
+    return ap.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    port, baud = args.port, args.baud
     frame = make_frame(NODE, SUB, SID, CMD)
 
     ser = serial.Serial(
-        PORT,
-        baudrate=BAUD,
+        port,
+        baudrate=baud,
         bytesize=serial.SEVENBITS, parity=serial.PARITY_EVEN, stopbits=serial.STOPBITS_TWO,
         timeout=0.01,              # 超短い分割タイムアウト（全体は deadline で管理）
         write_timeout=0.05
     )
 
-    print(f"[INFO] PORT={PORT} BAUD={BAUD} POLL={POLL_SEC*1000:.0f}ms CMD={CMD}")
+    # USB シリアル等のドライバが受信を数 ms まとめてから起こすのを止める（Linux のみ。失敗しても続行）
+    set_low_latency = getattr(ser, "set_low_latency_mode", None)
+    if set_low_latency is not None:
+        try:
+            set_low_latency(True)
+        except ValueError as e:
+            print(f"[WARN] low_latency not set: {e}")
+
+    print(f"[INFO] PORT={port} BAUD={baud} POLL={POLL_SEC*1000:.0f}ms CMD={CMD}")
     print(f"[INFO] TX frame: {hexdump(frame)}")
 
+    # ループ中の出力は行ごとに flush せず、秒が変わるたびにまとめて flush する
+    out = sys.stdout
+    out.flush()
+    if hasattr(out, "reconfigure"):
+        out.reconfigure(line_buffering=False)
+    write = out.write
+
+    pc = time.perf_counter
     try:
-        next_t = time.perf_counter()
+        next_t = pc()
+        need_flush = True  # 初回と、前回の受信が崩れたときだけ掃除する
+        ts_sec = -1        # ts（表示用時刻）を作った秒。秒が変わったときだけ整形し直す
+        ts = ""
         while True:
-            t0 = time.perf_counter()
+            t0 = pc()
 
-            # 前回の残りを掃除（ゴミで誤認しないように）
-            ser.reset_input_buffer()
+            # 前回の残りを掃除（ゴミで誤認しないように）。正常に1フレーム読み切った後は不要
+            if need_flush:
+                ser.reset_input_buffer()
+                need_flush = False
 
             # 送信
             ser.write(frame)
@@ -133,44 +176,54 @@ def main():
 
             # 受信
             resp = recv_one_frame(ser, RX_DEADLINE_SEC)
-            t1 = time.perf_counter()
+            t1 = pc()
+
+            now_sec = int(time.time())
+            if now_sec != ts_sec:
+                out.flush()
+                ts_sec = now_sec
+                ts = time.strftime("%H:%M:%S", time.localtime(now_sec))
 
             if resp is None:
-                print(f"{time.strftime('%H:%M:%S')} [TIMEOUT] no frame within {RX_DEADLINE_SEC*1000:.0f}ms")
+                need_flush = True
+                write(f"{ts} [TIMEOUT] no frame within {RX_DEADLINE_SEC*1000:.0f}ms\n")
             else:
                 p = parse_response(resp)
                 if not p["ok"]:
-                    print(f"{time.strftime('%H:%M:%S')} [PARSE ERR] {p.get('err')}  RX={hexdump(resp)}")
+                    need_flush = True
+                    write(f"{ts} [PARSE ERR] {p.get('err')}  RX={hexdump(resp)}\n")
                 else:
                     # 正常/異常の表示とデータ部解釈（C0系＝8桁/要素想定）
                     if p["end"] != "00":
-                        print(f"{time.strftime('%H:%M:%S')} [END={p['end']}] mres/sres={p['mres']}/{p['sres']} data='{p['data_hex']}'")
+                        write(f"{ts} [END={p['end']}] mres/sres={p['mres']}/{p['sres']} data='{p['data_hex']}'\n")
                     else:
                         d = p["data_hex"]
                         val_txt = ""
                         if len(d) >= 8:
                             raw_u32 = int(d[:8], 16)
                             # 符号付きに読み替え（負温度に備える）。小数点補正はしない（生値）
-                            val_s32 = raw_u32 - 0x100000000 if (raw_u32 & 0x80000000) else raw_u32
+                            # (x ^ 符号ビット) - 符号ビット で分岐なしに符号拡張
+                            val_s32 = (raw_u32 ^ 0x80000000) - 0x80000000
                             val_txt = f" raw32=0x{raw_u32:08X} ({val_s32})"
                         elif len(d) >= 4:
                             raw_u16 = int(d[:4], 16)
-                            val_s16 = raw_u16 - 0x10000 if (raw_u16 & 0x8000) else raw_u16
+                            val_s16 = (raw_u16 ^ 0x8000) - 0x8000
                             val_txt = f" raw16=0x{raw_u16:04X} ({val_s16})"
-                        print(f"{time.strftime('%H:%M:%S')} [OK] mres/sres={p['mres']}/{p['sres']} data='{p['data_hex']}'{val_txt}")
+                        write(f"{ts} [OK] mres/sres={p['mres']}/{p['sres']} data='{p['data_hex']}'{val_txt}\n")
 
             # 周期制御（できるだけ一定周期、ただし送受時間を考慮）
             next_t += POLL_SEC
-            sleep = next_t - time.perf_counter()
+            sleep = next_t - pc()
             if sleep < 0:
                 # 追いつけないときは今を基準にリセット
-                next_t = time.perf_counter()
+                next_t = pc()
             else:
                 time.sleep(sleep)
 
     except KeyboardInterrupt:
         pass
     finally:
+        out.flush()
         ser.close()
 
 